@@ -1,49 +1,261 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import mmap
 import os
 import re
 import sys
 
-def find_orphans(root_dir):
-    all_files = []
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to a compiled regex
+    ahocorasick = None
+
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build'}
+# Reads are latency bound and release the GIL, so oversubscribe the CPUs
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Below this size the mmap setup costs more than the copy it saves
+MMAP_MIN_SIZE = 4096
+# Per-file scan results, reused while a file's mtime and size are unchanged
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.find_orphans.cache.json')
+CACHE_VERSION = 1
+# A name that is a single word matches wherever it is a whole token
+WORD_RE = re.compile(rb'\w+')
+IDENTIFIER_RE = re.compile(r'\w+', re.ASCII)
+
+def _iter_tsx_files(directory):
+    # scandir exposes the entry type without an extra stat per file
+    try:
+        it = os.scandir(directory)
+    except OSError:
+        return
+
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from _iter_tsx_files(entry.path)
+            elif entry.name.endswith('.tsx') and not entry.name.endswith('.test.tsx'):
+                yield entry
+
+def _scan_file(path, match):
+    # Raw bytes: component names are ASCII, so decoding is wasted work.
+    # Larger files are mapped so the scan reads straight from the page cache;
+    # the map is released before the worker moves on, so at most
+    # READ_WORKERS files are open however large the tree is.
+    try:
+        with open(path, 'rb') as f:
+            # Empty files cannot be mapped at all
+            if os.fstat(f.fileno()).st_size < max(MMAP_MIN_SIZE, 1):
+                return match(f.read()), None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return match(content), None
+    except OSError as e:
+        return None, e
+
+def _is_word_char(char):
+    return char.isascii() and (char.isalnum() or char == '_')
+
+def _automaton_matcher(names):
+    # One automaton for every component name, then a single pass per file
+    automaton = ahocorasick.Automaton()
+    for name in names:
+        automaton.add_word(name, name)
+    automaton.make_automaton()
+
+    def match(content):
+        text = str(content, 'utf-8', errors='replace')
+        found = set()
+        for end, name in automaton.iter(text):
+            # Same whole-word rule as the regex scan
+            start = end - len(name) + 1
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end + 1 < len(text) and _is_word_char(text[end + 1]):
+                continue
+            found.add(name)
+        return found
+
+    return match
+
+def _bounded_prefixes(match, names):
+    # Names that start where `match` starts and are followed by a non-word
+    # character inside it, e.g. "Button" within "Button.styles"
+    found = {match}
+    for i in range(1, len(match)):
+        if not _is_word_char(match[i]) and match[:i] in names:
+            found.add(match[:i])
+    return found
+
+def _regex_matcher(names):
+    # One alternation of every name, longest first. The lookahead tries
+    # every position, so "utils" inside "test-utils" is still seen, and
+    # shorter names sharing a start are recovered from each match. A name
+    # must not touch a word character on either side (the automaton's rule);
+    # unlike \b this also holds for names like "[id]" that start or end
+    # with punctuation, and still stops "Button" matching in "ButtonGroup"
+    names = set(names)
+    names_sorted = sorted(names, key=len, reverse=True)
+    alternation = b'|'.join(re.escape(name.encode('utf-8')) for name in names_sorted)
+    pattern = re.compile(rb'(?<![A-Za-z0-9_])(?=(' + alternation + rb')(?![A-Za-z0-9_]))')
+    expanded = {}
+
+    def match(content):
+        found = set()
+        for matched in {m.group(1).decode('utf-8') for m in pattern.finditer(content)}:
+            if matched not in expanded:
+                expanded[matched] = _bounded_prefixes(matched, names)
+            found |= expanded[matched]
+        return found
+
+    return match
+
+def _token_matcher(names):
+    # Flip the search: tokenize each file once and look the tokens up,
+    # rather than searching each file for every name. Names that are not
+    # a single word (e.g. "test-utils") still go through the regex.
+    identifiers = {}
+    others = []
+    for name in names:
+        if IDENTIFIER_RE.fullmatch(name):
+            identifiers[name.encode('utf-8')] = name
+        else:
+            others.append(name)
+    match_others = _regex_matcher(others) if others else None
+
+    def match(content):
+        found = {identifiers[t] for t in identifiers.keys() & set(WORD_RE.findall(content))}
+        if match_others is not None:
+            found |= match_others(content)
+        return found
+
+    return match
+
+def _scan(file_map, names):
+    # Returns the component names referenced by each readable file
+    if not file_map or not names:
+        return {rel_path: set() for rel_path in file_map}
+
+    match = _automaton_matcher(names) if ahocorasick is not None else _token_matcher(names)
+
+    rel_paths = list(file_map)
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        results = executor.map(
+            _scan_file, [file_map[p]['path'] for p in rel_paths], [match] * len(rel_paths)
+        )
+
+        # Merge on this thread so workers never touch shared state
+        refs = {}
+        for rel_path, (found, error) in zip(rel_paths, results):
+            if error is not None:
+                print(f"Error reading {rel_path}: {error}", file=sys.stderr)
+            else:
+                refs[rel_path] = found
+
+    return refs
+
+def _is_str_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+def _load_cache(cache_path, root_dir):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # Anything that is not the shape _save_cache writes is a cache miss
+    if not isinstance(cache, dict):
+        return None
+    if cache.get('version') != CACHE_VERSION or cache.get('root') != os.path.abspath(root_dir):
+        return None
+    if not _is_str_list(cache.get('names')) or not isinstance(cache.get('files'), dict):
+        return None
+    for entry in cache['files'].values():
+        if not (
+            isinstance(entry, dict)
+            and isinstance(entry.get('mtime_ns'), int)
+            and isinstance(entry.get('size'), int)
+            and _is_str_list(entry.get('refs'))
+        ):
+            return None
+    return cache
+
+def _save_cache(cache_path, cache):
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"Could not write cache {cache_path}: {e}", file=sys.stderr)
+
+def find_orphans(root_dir, cache_path=CACHE_PATH):
     file_map = {}
-    
+    # Component name -> every file defining it (basenames can collide)
+    name_index = {}
+
     # 1. Index all .tsx files
-    for root, dirs, files in os.walk(root_dir):
-        for file in files:
-            if file.endswith('.tsx') and not file.endswith('.test.tsx'):
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, root_dir)
-                all_files.append(rel_path)
-                
-                # Store filename without extension for searching
-                name_no_ext = os.path.splitext(file)[0]
-                file_map[rel_path] = {
-                    'name': name_no_ext,
-                    'path': full_path,
-                    'is_used': False
+    prefix_len = len(os.path.join(root_dir, ''))
+    for entry in _iter_tsx_files(root_dir):
+        rel_path = entry.path[prefix_len:]
+        try:
+            stat = entry.stat()
+        except OSError as e:
+            # e.g. a dangling symlink; report it like any unreadable file
+            print(f"Error reading {rel_path}: {e}", file=sys.stderr)
+            continue
+
+        # Store filename without extension for searching
+        name_no_ext = entry.name[:-len('.tsx')]
+        file_map[rel_path] = {
+            'name': name_no_ext,
+            'path': entry.path,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'is_used': False
+        }
+        name_index.setdefault(name_no_ext, []).append(rel_path)
+
+    # 2. Search for usages, rescanning only files changed since the last run
+    names = set(name_index)
+    cache = _load_cache(cache_path, root_dir) if cache_path else None
+    cached_files = cache['files'] if cache else {}
+    # Unchanged files were only checked for the names known at the time
+    new_names = names.difference(cache['names']) if cache else names
+
+    stale = {}
+    fresh = {}
+    for rel_path, data in file_map.items():
+        entry = cached_files.get(rel_path)
+        if entry and entry['mtime_ns'] == data['mtime_ns'] and entry['size'] == data['size']:
+            fresh[rel_path] = data
+        else:
+            stale[rel_path] = data
+
+    refs = _scan(stale, names)
+    new_refs = _scan(fresh, new_names)
+    for rel_path in fresh:
+        refs[rel_path] = names.intersection(cached_files[rel_path]['refs']) | new_refs.get(rel_path, set())
+
+    if cache_path:
+        _save_cache(cache_path, {
+            'version': CACHE_VERSION,
+            'root': os.path.abspath(root_dir),
+            'names': sorted(names),
+            'files': {
+                rel_path: {
+                    'mtime_ns': file_map[rel_path]['mtime_ns'],
+                    'size': file_map[rel_path]['size'],
+                    'refs': sorted(file_refs),
                 }
+                for rel_path, file_refs in refs.items()
+            },
+        })
 
-    # 2. Search for usages
-    for checker_path in all_files:
-        checker_full_path = file_map[checker_path]['path']
-        
-        try:
-            with open(checker_full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Check usage of OTHER files in THIS file
-            for potential_orphan in all_files:
-                if potential_orphan == checker_path:
-                    continue
-                    
-                orphan_name = file_map[potential_orphan]['name']
-                
-                # Simple heuristic: check if the component name appears in the content
-                # This is not perfect (could be false positives), but good for a first pass
-                if orphan_name in content:
+    # Usage of OTHER files in THIS file marks them as used
+    for checker_path, file_refs in refs.items():
+        for name in file_refs:
+            for potential_orphan in name_index[name]:
+                if potential_orphan != checker_path:
                     file_map[potential_orphan]['is_used'] = True
-                    
-        except Exception as e:
-            print(f"Error reading {checker_path}: {e}")
 
     # 3. Identify orphans
     orphans = []
@@ -51,24 +263,31 @@ def find_orphans(root_dir):
         # Exclude obvious entry points
         if file_path in ['index.tsx', 'App.tsx', 'main.tsx', 'router/AppRouter.tsx']:
             continue
-            
+
         if not data['is_used']:
             orphans.append(file_path)
 
     return orphans
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python find_orphans.py <root_dir>")
-        print("Example: python find_orphans.py src/client/src")
-        sys.exit(1)
-        
-    root_dir = sys.argv[1]
+def main(root_dir=None):
+    # Importable entry point; reads the root from argv when not given
+    if root_dir is None:
+        if len(sys.argv) < 2:
+            print("Usage: python find_orphans.py <root_dir>")
+            print("Example: python find_orphans.py src/client/src")
+            print("Uses pyahocorasick if installed")
+            sys.exit(1)
+        root_dir = sys.argv[1]
+
     if not os.path.isabs(root_dir):
         root_dir = os.path.abspath(root_dir)
-        
+
     orphans = find_orphans(root_dir)
-    
-    print(f"Potential Orphaned Components in {root_dir}:")
-    for orphan in sorted(orphans):
-        print(f"- {orphan}")
+
+    # Build the report up front and emit it with a single write
+    lines = [f"Potential Orphaned Components in {root_dir}:"]
+    lines.extend(f"- {orphan}" for orphan in sorted(orphans))
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+if __name__ == "__main__":
+    main()
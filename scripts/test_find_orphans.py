@@ -0,0 +1,152 @@
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import find_orphans
+
+# Overlapping names (Alert/AlertPanel, Button/ButtonGroup), names that are
+# not a single word (Button.styles, test-utils), names wrapped in
+# punctuation (route files like [id] and (Foo)), a lowercase name,
+# duplicate basenames and a file large enough to be memory-mapped
+FIXTURE = {
+    'App.tsx': (
+        "import styles from './Button.styles'\n"
+        "import { render } from './test-utils'\n"
+        "import nav from './navigation'\n"
+        "import a from './a/index'\n"
+        "import Item from './[id]'\n"
+        "import Group from './(Foo)'\n"
+        "export const App = () => <AlertPanel><ButtonGroup /><Big /></AlertPanel>\n"
+    ),
+    'Alert.tsx': 'export default 1\n',
+    'AlertPanel.tsx': 'export default 1\n',
+    'Button.tsx': 'export default 1\n',
+    'Button.styles.tsx': 'export default 1\n',
+    'ButtonGroup.tsx': 'export default 1\n',
+    'utils.tsx': 'export default 1\n',
+    'test-utils.tsx': 'export default 1\n',
+    'navigation.tsx': 'export default 1\n',
+    '[id].tsx': 'export default 1\n',
+    '(Foo).tsx': 'export default 1\n',
+    'Big.tsx': 'export const big = <Lazy />\n' + '// padding\n' * 512,
+    'Lazy.tsx': 'export default 1\n',
+    'Unused.tsx': 'export default 1\n',
+    'Empty.tsx': '',
+    os.path.join('a', 'index.tsx'): 'export default 1\n',
+    os.path.join('b', 'index.tsx'): 'export default 1\n',
+}
+
+# "Alert" only ever appears inside "AlertPanel"
+EXPECTED_ORPHANS = {'Alert.tsx', 'Empty.tsx', 'Unused.tsx'}
+
+class BackendParityTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        for rel_path, content in FIXTURE.items():
+            path = os.path.join(self.root, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+    def find_orphans_with(self, **backends):
+        # Every optional backend is off unless the test turns it on
+        patches = {'ahocorasick': None}
+        patches.update(backends)
+        with mock.patch.multiple(find_orphans, **patches):
+            return set(find_orphans.find_orphans(self.root, cache_path=None))
+
+    def test_tokens(self):
+        self.assertEqual(self.find_orphans_with(), EXPECTED_ORPHANS)
+
+    def test_regex(self):
+        orphans = self.find_orphans_with(_token_matcher=find_orphans._regex_matcher)
+        self.assertEqual(orphans, EXPECTED_ORPHANS)
+
+    @unittest.skipIf(find_orphans.ahocorasick is None, 'pyahocorasick not installed')
+    def test_automaton(self):
+        orphans = self.find_orphans_with(ahocorasick=find_orphans.ahocorasick)
+        self.assertEqual(orphans, EXPECTED_ORPHANS)
+
+class IndexingTest(unittest.TestCase):
+    def test_dangling_symlink_is_skipped(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        with open(os.path.join(root, 'Used.tsx'), 'w', encoding='utf-8') as f:
+            f.write('export default 1\n')
+        with open(os.path.join(root, 'App.tsx'), 'w', encoding='utf-8') as f:
+            f.write('<Used />\n')
+        os.symlink(os.path.join(root, 'missing.tsx'), os.path.join(root, 'Dangling.tsx'))
+
+        # Diagnostics go to stderr so stdout carries only the report
+        with mock.patch('sys.stdout', new=io.StringIO()) as stdout, \
+                mock.patch('sys.stderr', new=io.StringIO()) as stderr:
+            self.assertEqual(find_orphans.find_orphans(root, cache_path=None), [])
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertIn('Error reading Dangling.tsx', stderr.getvalue())
+
+class FileDescriptorTest(unittest.TestCase):
+    @unittest.skipIf(resource is None or not os.path.isdir('/proc/self/fd'), 'needs RLIMIT_NOFILE and /proc')
+    def test_mapped_files_are_released_per_file(self):
+        # Every file is mapped; with a tight fd limit nothing may be
+        # reported unreadable (and so wrongly orphaned)
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        count = 200
+        with open(os.path.join(root, 'App.tsx'), 'w', encoding='utf-8') as f:
+            f.write('<Part0 />\n')
+        for i in range(count):
+            with open(os.path.join(root, f'Part{i}.tsx'), 'w', encoding='utf-8') as f:
+                f.write(f'<Part{(i + 1) % count} />\n' + '// padding\n' * 64)
+
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        limit = len(os.listdir('/proc/self/fd')) + 32
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+        self.addCleanup(resource.setrlimit, resource.RLIMIT_NOFILE, (soft, hard))
+
+        with mock.patch.multiple(find_orphans, MMAP_MIN_SIZE=0, READ_WORKERS=4):
+            self.assertEqual(find_orphans.find_orphans(root, cache_path=None), [])
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        for rel_path, content in {'App.tsx': '<Used />\n', 'Used.tsx': '', 'Unused.tsx': ''}.items():
+            with open(os.path.join(self.root, rel_path), 'w', encoding='utf-8') as f:
+                f.write(content)
+        self.cache_path = os.path.join(self.root, 'cache.json')
+
+    def test_malformed_cache_is_a_miss(self):
+        root = os.path.abspath(self.root)
+        for content in [
+            'null',
+            '[]',
+            '{"version": %d, "root": %s}' % (find_orphans.CACHE_VERSION, json.dumps(root)),
+            '{"version": %d, "root": %s, "names": [], "files": {"App.tsx": null}}'
+            % (find_orphans.CACHE_VERSION, json.dumps(root)),
+        ]:
+            with self.subTest(content=content):
+                with open(self.cache_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                self.assertEqual(find_orphans.find_orphans(self.root, self.cache_path), ['Unused.tsx'])
+
+    def test_cached_run_matches_fresh_run(self):
+        find_orphans.find_orphans(self.root, self.cache_path)
+        with open(os.path.join(self.root, 'Later.tsx'), 'w', encoding='utf-8') as f:
+            f.write('<Unused />\n')
+        self.assertEqual(find_orphans.find_orphans(self.root, self.cache_path), ['Later.tsx'])
+
+if __name__ == "__main__":
+    unittest.main()